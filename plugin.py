@@ -5,18 +5,32 @@ IgnorePhrasePlugin - 忽略短语插件
 支持精确短语匹配和正则表达式匹配两种方式。
 """
 
+import os
 import re
+import shutil
+import time
 import logging
+from contextlib import contextmanager, suppress
+from operator import methodcaller
 from pathlib import Path
-from typing import List, Tuple, Type, Dict, Optional
+from types import SimpleNamespace
+from typing import List, Tuple, Type, Dict, Optional, Set, Iterable, Iterator, Callable, FrozenSet
 
 try:
+    import tomllib as tomli
+except ImportError:
     import tomli
+
+try:
     import tomli_w
 except ImportError:
-    import tomllib as tomli
     tomli_w = None
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 from src.plugin_system import (
     BasePlugin,
     register_plugin,
@@ -30,9 +44,16 @@ from src.plugin_system import (
 
 logger = logging.getLogger(__name__)
 
+# 匹配正则中的数字反向引用 (\1) 和条件组 (?(1)...)，用于判断能否安全合并正则
+_NUMERIC_GROUP_REF = re.compile(r"\\[1-9]|\(\?\(\d")
+
 
 # ===== 配置管理器 =====
 
+class ConfigWriteError(Exception):
+    """配置文件写入失败"""
+
+
 class ConfigManager:
     """
     负责直接读写 config.toml 文件。
@@ -40,29 +61,44 @@ class ConfigManager:
     """
     _instance = None
     config_path: Optional[Path] = None
-
+    # 已解析的配置缓存，文件 (st_mtime_ns, st_size) 不变时直接复用
+    # 同时比较大小，避免时间戳精度较粗的文件系统上同一时刻的外部修改被忽略
+    _cached: Optional[Dict] = None
+    _cached_stat: Optional[Tuple[int, int]] = None
+    # 列表成员集合索引，用于 O(1) 判重，与其所属的配置字典绑定
+    _index_owner: Optional[Dict] = None
+    _indexes: Dict[Tuple[str, str], Set[str]] = {}
     def __new__(cls, *args, **kwargs):
         if not cls._instance:
             cls._instance = super(ConfigManager, cls).__new__(cls)
+            # 正则编译缓存: (模式, flags) -> 编译结果，在命令验证、存储和消息匹配之间共享
+            cls._instance._compiled_patterns: Dict[Tuple[str, int], re.Pattern] = {}
         return cls._instance
 
     def load(self, plugin_dir: str):
         """设置配置文件路径"""
         self.config_path = Path(plugin_dir) / "config.toml"
+        self._compiled_patterns = {}
         logger.info(f"配置文件路径: {self.config_path}")
         if tomli_w is None:
             logger.warning("tomli_w 未安装，命令添加/删除功能将不可用")
 
     def _read_config(self) -> Dict:
-        """读取配置文件"""
-        if not self.config_path or not self.config_path.exists():
+        """读取配置文件，文件未修改时返回缓存的解析结果"""
+        # stat 同时用于判断文件是否存在和缓存是否有效
+        file_stat = self._stat_config()
+        if file_stat is None:
             logger.warning(f"配置文件不存在: {self.config_path}")
             return {}
         try:
-            with open(self.config_path, "rb") as f:
-                config = tomli.load(f)
-                logger.debug(f"读取配置成功: {list(config.keys())}")
-                return config
+            if self._cached is not None and file_stat == self._cached_stat:
+                return self._cached
+            # 一次性读入内存后解析，省去文件对象的逐块读取
+            config = tomli.loads(self.config_path.read_bytes().decode("utf-8"))
+            logger.debug(f"读取配置成功: {list(config.keys())}")
+            self._cached = config
+            self._cached_stat = file_stat
+            return config
         except Exception as e:
             logger.error(f"读取配置文件失败: {e}")
             return {}
@@ -73,74 +109,194 @@ class ConfigManager:
             logger.error("配置文件路径未设置")
             return False
         if tomli_w is None:
+            self._cached = None
             logger.error("tomli_w 未安装，无法写入配置。请安装: pip install tomli_w")
             return False
+        # 配置文件为符号链接时替换其指向的实际文件，保留链接本身
+        target = self.config_path.resolve()
+        tmp_path = target.with_name(target.name + ".tmp")
         try:
-            with open(self.config_path, "wb") as f:
-                tomli_w.dump(config, f)
+            # 先在内存中序列化并写入临时文件，落盘后再原子替换，写入中途崩溃或断电不会损坏原配置
+            data = tomli_w.dumps(config).encode("utf-8")
+            with open(tmp_path, "wb") as f:
+                # 写入内容前沿用原文件权限 (配置中包含权限用户名单)
+                with suppress(FileNotFoundError):
+                    shutil.copymode(target, tmp_path)
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, target)
+            # 刚写入的内容无需再次解析，直接更新缓存
+            self._cached = config
+            self._cached_stat = self._stat_config()
             logger.info(f"配置已保存到: {self.config_path}")
             return True
         except Exception as e:
+            # 调用方可能已原地修改了缓存的配置，写入失败时丢弃缓存
+            self._cached = None
+            with suppress(OSError):
+                tmp_path.unlink()
             logger.error(f"写入配置文件失败: {e}", exc_info=True)
             return False
 
+    def _stat_config(self) -> Optional[Tuple[int, int]]:
+        """返回配置文件的 (st_mtime_ns, st_size)，文件不存在时返回 None"""
+        if not self.config_path:
+            return None
+        try:
+            st = self.config_path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _member_set(self, config: Dict, section: str, key: str) -> Set[str]:
+        """
+        获取 config[section][key] 列表的成员集合
+
+        集合随配置字典缓存，配置重新读取后自动重建；
+        修改列表时需同步更新集合。
+        """
+        if config is not self._index_owner:
+            self._index_owner = config
+            self._indexes = {}
+        index = self._indexes.get((section, key))
+        if index is None:
+            index = set(config.get(section, {}).get(key, []))
+            self._indexes[(section, key)] = index
+        return index
+
+    def compile_pattern(self, pattern: str, flags: int = 0) -> re.Pattern:
+        """
+        编译正则表达式并缓存结果
+
+        添加命令验证时编译的结果会被消息处理器直接复用。
+        无效的正则表达式抛出 re.error 或 ValueError (如冲突的内联标志)，不会被缓存。
+        """
+        key = (pattern, flags)
+        compiled = self._compiled_patterns.get(key)
+        if compiled is None:
+            compiled = re.compile(pattern, flags)
+            self._compiled_patterns[key] = compiled
+        return compiled
+
+    def retain_compiled_patterns(self, patterns: Iterable[str], flags: int):
+        """只保留当前配置中的正则表达式 (按当前 flags) 的编译结果，其余丢弃"""
+        keep = {(pattern, flags) for pattern in patterns}
+        for key in [k for k in self._compiled_patterns if k not in keep]:
+            del self._compiled_patterns[key]
+
     def get_phrases(self) -> List[str]:
-        """获取屏蔽词列表"""
+        """获取屏蔽词列表 (副本，修改不会影响配置缓存)"""
         config = self._read_config()
-        return config.get("phrases", {}).get("list", [])
+        return list(config.get("phrases", {}).get("list", []))
 
     def get_patterns(self) -> List[str]:
-        """获取正则表达式列表"""
+        """获取正则表达式列表 (副本，修改不会影响配置缓存)"""
         config = self._read_config()
-        return config.get("regex", {}).get("patterns", [])
+        return list(config.get("regex", {}).get("patterns", []))
+
+    @contextmanager
+    def batch(self) -> Iterator[Dict]:
+        """
+        批量修改配置
+
+        进入时读取一次配置，with 块内原地修改，退出时统一写回一次。
+        块内抛出异常时不写入；写入失败时抛出 ConfigWriteError。
+        """
+        config = self._read_config()
+        try:
+            yield config
+        except BaseException:
+            # 块内可能已原地修改了缓存的配置，放弃修改时丢弃缓存
+            self._cached = None
+            raise
+        if not self._write_config(config):
+            raise ConfigWriteError(f"写入配置文件失败: {self.config_path}")
+
+    def _add_items(self, section: str, key: str, items: Iterable[str]) -> List[str]:
+        """向 config[section][key] 批量添加不重复的项，返回实际添加的项"""
+        items = list(dict.fromkeys(items))
+        # 全部已存在时不写文件 (读取命中缓存，仅一次 stat)
+        existing = self._member_set(self._read_config(), section, key)
+        if all(item in existing for item in items):
+            return []
+        try:
+            with self.batch() as config:
+                existing = self._member_set(config, section, key)
+                added = [item for item in items if item not in existing]
+                config.setdefault(section, {}).setdefault(key, []).extend(added)
+                existing.update(added)
+        except ConfigWriteError:
+            return []
+        return added
+
+    def _del_items(self, section: str, key: str, items: Iterable[str]) -> List[str]:
+        """从 config[section][key] 批量删除项 (含重复项)，返回实际删除的项"""
+        items = list(dict.fromkeys(items))
+        existing = self._member_set(self._read_config(), section, key)
+        if not any(item in existing for item in items):
+            return []
+        try:
+            with self.batch() as config:
+                existing = self._member_set(config, section, key)
+                removed = [item for item in items if item in existing]
+                removed_set = set(removed)
+                values = config[section][key]
+                values[:] = [v for v in values if v not in removed_set]
+                existing.difference_update(removed_set)
+        except ConfigWriteError:
+            return []
+        return removed
+
+    def add_phrases(self, phrases: Iterable[str]) -> List[str]:
+        """批量添加屏蔽词，返回实际添加的屏蔽词"""
+        return self._add_items("phrases", "list", phrases)
+
+    def add_patterns(self, patterns: Iterable[str], flags: int = 0) -> List[str]:
+        """
+        批量添加正则表达式，返回实际添加的正则表达式
+
+        只保存能成功编译的正则表达式，无效的记录警告后跳过，
+        消息处理器因此无需在匹配时处理编译错误。
+        """
+        valid = []
+        for pattern in patterns:
+            try:
+                self.compile_pattern(pattern, flags)
+            except (re.error, ValueError) as e:
+                logger.warning(f"跳过无效的正则表达式 '{pattern}': {e}")
+                continue
+            valid.append(pattern)
+        return self._add_items("regex", "patterns", valid)
+
+    def del_phrases(self, phrases: Iterable[str]) -> List[str]:
+        """批量删除屏蔽词，返回实际删除的屏蔽词"""
+        return self._del_items("phrases", "list", phrases)
+
+    def del_patterns(self, patterns: Iterable[str]) -> List[str]:
+        """批量删除正则表达式，返回实际删除的正则表达式"""
+        removed = self._del_items("regex", "patterns", patterns)
+        if removed:
+            removed_set = set(removed)
+            for key in [k for k in self._compiled_patterns if k[0] in removed_set]:
+                del self._compiled_patterns[key]
+        return removed
 
     def add_phrase(self, phrase: str) -> bool:
         """添加屏蔽词"""
-        config = self._read_config()
-        if "phrases" not in config:
-            config["phrases"] = {}
-        phrases = list(config["phrases"].get("list", []))
-        if phrase in phrases:
-            return False
-        phrases.append(phrase)
-        config["phrases"]["list"] = phrases
-        return self._write_config(config)
+        return bool(self.add_phrases([phrase]))
 
-    def add_pattern(self, pattern: str) -> bool:
+    def add_pattern(self, pattern: str, flags: int = 0) -> bool:
         """添加正则表达式"""
-        config = self._read_config()
-        if "regex" not in config:
-            config["regex"] = {}
-        patterns = list(config["regex"].get("patterns", []))
-        if pattern in patterns:
-            return False
-        patterns.append(pattern)
-        config["regex"]["patterns"] = patterns
-        return self._write_config(config)
+        return bool(self.add_patterns([pattern], flags))
 
     def del_phrase(self, phrase: str) -> bool:
         """删除屏蔽词"""
-        config = self._read_config()
-        phrases = list(config.get("phrases", {}).get("list", []))
-        if phrase not in phrases:
-            return False
-        phrases.remove(phrase)
-        if "phrases" not in config:
-            config["phrases"] = {}
-        config["phrases"]["list"] = phrases
-        return self._write_config(config)
+        return bool(self.del_phrases([phrase]))
 
     def del_pattern(self, pattern: str) -> bool:
         """删除正则表达式"""
-        config = self._read_config()
-        patterns = list(config.get("regex", {}).get("patterns", []))
-        if pattern not in patterns:
-            return False
-        patterns.remove(pattern)
-        if "regex" not in config:
-            config["regex"] = {}
-        config["regex"]["patterns"] = patterns
-        return self._write_config(config)
+        return bool(self.del_patterns([pattern]))
 
 
 # 全局配置管理器实例
@@ -149,6 +305,26 @@ config_manager = ConfigManager()
 
 # ===== 权限检查工具函数 =====
 
+# 用户名单集合缓存: (原始名单元组, 转为字符串后的集合)
+_user_set_cache: Tuple[Tuple, FrozenSet[str]] = ((), frozenset())
+
+
+def _get_user_set(user_list_raw: List) -> FrozenSet[str]:
+    """
+    获取用户名单的字符串集合
+
+    名单内容与上次相同时复用缓存，避免每次检查都逐个 str() 转换；
+    按内容比较，原地修改名单也会立即生效。
+    """
+    global _user_set_cache
+    source, user_set = _user_set_cache
+    current = tuple(user_list_raw)
+    if current != source:
+        user_set = frozenset(str(u) for u in current)
+        _user_set_cache = (current, user_set)
+    return user_set
+
+
 def check_permission(user_id: str, config: Optional[Dict]) -> bool:
     """
     检查用户是否有权限执行命令
@@ -158,14 +334,13 @@ def check_permission(user_id: str, config: Optional[Dict]) -> bool:
 
     user_control = config.get("user_control", {})
     list_type = user_control.get("list_type", "whitelist")
-    user_list_raw = user_control.get("list", [])
-    user_list = {str(u) for u in user_list_raw} if user_list_raw else set()
+    if list_type not in ("whitelist", "blacklist"):
+        return False
 
+    user_list = _get_user_set(user_control.get("list") or [])
     if list_type == "whitelist":
         return user_id in user_list
-    elif list_type == "blacklist":
-        return user_id not in user_list
-    return False
+    return user_id not in user_list
 
 
 class PermissionMixin:
@@ -300,14 +475,15 @@ class IgnoreAddRegexCommand(PermissionMixin, BaseCommand):
             await self.send_text("❌ 请指定正则表达式\n用法: /ignore addr <正则>")
             return False, "参数缺失", True
 
-        # 验证正则表达式
+        # 验证正则表达式，按当前大小写设置编译，编译结果供消息处理器复用
+        flags = 0 if self.get_config("regex.case_sensitive", False) else re.IGNORECASE
         try:
-            re.compile(pattern)
-        except re.error as e:
+            config_manager.compile_pattern(pattern, flags)
+        except (re.error, ValueError) as e:
             await self.send_text(f"❌ 无效的正则表达式: {e}")
             return False, "正则无效", True
 
-        if config_manager.add_pattern(pattern):
+        if config_manager.add_pattern(pattern, flags):
             await self.send_text(f"✅ 已添加正则表达式: {pattern}")
             return True, f"添加正则: {pattern}", True
         else:
@@ -378,75 +554,170 @@ class IgnoreMessageHandler(BaseEventHandler):
     handler_description = "拦截匹配配置短语或正则表达式的消息"
     intercept_message = True  # 启用拦截能力
 
-    def _check_phrase_match(self, text: str, phrases: List[str], match_mode: str, case_sensitive: bool) -> bool:
+    # 配置快照的最长复用时间 (秒)，用于发现被原地修改的配置
+    config_snapshot_ttl = 1.0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # 配置快照，_cfg_source 为构建快照时的 plugin_config
+        self._cfg: Optional[SimpleNamespace] = None
+        self._cfg_source: Optional[Dict] = None
+        self._cfg_expires = 0.0
+        # 预编译正则缓存，只保留最近一次的结果，_compiled_sig 记录构建时的 (模式元组, flags)
+        self._compiled: List[re.Pattern] = []
+        self._compiled_sig: Optional[Tuple[Tuple[str, ...], int]] = None
+        # 短语匹配函数缓存，_phrase_matcher_sig 记录构建时的 (短语元组, 匹配模式, 区分大小写)
+        self._phrase_matcher: Optional[Callable[[str], object]] = None
+        self._phrase_matcher_sig: Optional[Tuple[Tuple[str, ...], str, bool]] = None
+
+    def _get_phrase_matcher(
+        self, phrases: List[str], match_mode: str, case_sensitive: bool
+    ) -> Optional[Callable[[str], object]]:
+        """
+        获取当前匹配模式对应的匹配函数
+
+        匹配模式的分支判断只在构建时进行一次，逐条消息直接调用匹配函数，
+        仅在短语列表或匹配设置变化时重新构建。没有有效短语时返回 None。
+        不区分大小写时，所有模式都将文本和短语用 str.lower() 转为小写后比较，
+        保证各模式的大小写处理一致。
         """
-        检查文本是否匹配短语列表
-        
-        Args:
-            text: 要检查的文本
-            phrases: 短语列表
-            match_mode: 匹配模式 (contains, exact, startswith, endswith)
-            case_sensitive: 是否区分大小写
-            
-        Returns:
-            bool: 是否匹配
+        sig = (tuple(phrases), match_mode, case_sensitive)
+        if sig == self._phrase_matcher_sig:
+            return self._phrase_matcher
+
+        valid = tuple(p for p in phrases if p)  # 跳过空短语
+        if not valid:
+            matcher = None
+        elif match_mode in ("startswith", "endswith"):
+            # startswith/endswith 接受元组参数，直接在 C 层遍历所有短语
+            if case_sensitive:
+                matcher = methodcaller(match_mode, valid)
+            else:
+                check = methodcaller(match_mode, tuple(p.lower() for p in valid))
+
+                def matcher(text: str) -> bool:
+                    return check(text.lower())
+        elif match_mode == "exact":
+            matcher = self._build_exact_matcher(valid, case_sensitive)
+        elif ahocorasick is not None:
+            # 自动机不支持忽略大小写，只能匹配小写后的文本
+            matcher = self._build_automaton_matcher(valid, case_sensitive)
+        else:  # contains (default)
+            # re 会用分支表达式的首字符集合快速跳过不可能命中的位置，
+            # 但 IGNORECASE 下这一预筛选失效 (实测慢约 10 倍)，
+            # 因此不区分大小写时转为小写后用区分大小写的正则匹配。
+            # 逐个短语 `in` 或编码为 bytes 后 find 均需 Python 层循环，实测比单个正则慢数倍
+            if case_sensitive:
+                matcher = self._build_phrase_regex(valid, 0).search
+            else:
+                search = self._build_phrase_regex(tuple(p.lower() for p in valid), 0).search
+
+                def matcher(text: str) -> Optional[re.Match]:
+                    return search(text.lower())
+
+        self._phrase_matcher = matcher
+        self._phrase_matcher_sig = sig
+        return matcher
+
+    @staticmethod
+    def _build_exact_matcher(phrases: Tuple[str, ...], case_sensitive: bool) -> Callable[[str], bool]:
         """
-        if not text or not phrases:
-            return False
-            
-        check_text = text if case_sensitive else text.lower()
-        
+        构建 exact 模式的匹配函数
+
+        短语存入 frozenset，整条消息只需一次哈希查找。
+        """
+        if case_sensitive:
+            return frozenset(phrases).__contains__
+
+        lowered = frozenset(p.lower() for p in phrases)
+        # lower() 不会缩短文本，比最长短语还长的消息不可能命中，无需转小写
+        max_length = max(map(len, lowered))
+        return lambda text: len(text) <= max_length and text.lower() in lowered
+
+    @staticmethod
+    def _build_automaton_matcher(phrases: Tuple[str, ...], case_sensitive: bool) -> Callable[[str], bool]:
+        """
+        构建 contains 模式使用的 Aho-Corasick 自动机匹配函数
+
+        多个短语构建为一个自动机，线性时间扫描一遍文本即可判断是否命中。
+        """
+        automaton = ahocorasick.Automaton()
         for phrase in phrases:
-            if not phrase:  # 跳过空短语
-                continue
             check_phrase = phrase if case_sensitive else phrase.lower()
-            
-            if match_mode == "exact":
-                if check_text == check_phrase:
-                    return True
-            elif match_mode == "startswith":
-                if check_text.startswith(check_phrase):
-                    return True
-            elif match_mode == "endswith":
-                if check_text.endswith(check_phrase):
-                    return True
-            else:  # contains (default)
-                if check_phrase in check_text:
-                    return True
-        
-        return False
+            automaton.add_word(check_phrase, check_phrase)
+        automaton.make_automaton()
+
+        if case_sensitive:
+            return lambda text: next(automaton.iter(text), None) is not None
+        return lambda text: next(automaton.iter(text.lower()), None) is not None
 
-    def _check_regex_match(self, text: str, patterns: List[str], case_sensitive: bool) -> bool:
+    @staticmethod
+    def _build_phrase_regex(phrases: Tuple[str, ...], flags: int) -> re.Pattern:
         """
-        检查文本是否匹配正则表达式模式列表
-        
-        Args:
-            text: 要检查的文本
-            patterns: 正则表达式模式列表
-            case_sensitive: 是否区分大小写
-            
-        Returns:
-            bool: 是否匹配
+        构建由全部短语合并而成的正则表达式
+
+        所有短语转义后合并为一个分支表达式，一次扫描即可完成匹配。
         """
-        if not text or not patterns:
-            return False
-            
-        flags = 0 if case_sensitive else re.IGNORECASE
-        
+        return re.compile("|".join(re.escape(p) for p in phrases), flags)
+
+    def _get_compiled_patterns(self, patterns: List[str], flags: int) -> List[re.Pattern]:
+        """
+        获取预编译的正则表达式列表
+
+        仅在模式列表或 flags 变化时重新编译。
+        命令添加的正则表达式已预先验证；对于 WebUI 或手动写入的无效正则表达式，
+        只在编译时记录一次警告并从列表中剔除，匹配时无需异常处理。
+        能安全合并时，所有模式会合并为一个分支表达式，一次扫描完成匹配。
+        """
+        sig = (tuple(patterns), flags)
+        if sig == self._compiled_sig:
+            return self._compiled
+
+        compiled = []
         for pattern in patterns:
             if not pattern:  # 跳过空模式
                 continue
             try:
-                if re.search(pattern, text, flags):
-                    return True
-            except re.error as e:
-                # 无效的正则表达式，记录警告并跳过
-                debug_enabled = self.get_config("logging.debug", False)
-                if debug_enabled:
-                    logger.warning(f"无效的正则表达式 '{pattern}': {e}")
-                continue
-        
-        return False
+                compiled.append(config_manager.compile_pattern(pattern, flags))
+            except (re.error, ValueError) as e:
+                logger.warning(f"无效的正则表达式 '{pattern}': {e}")
+
+        # WebUI 删除的模式或旧大小写设置下的编译结果不再需要
+        config_manager.retain_compiled_patterns(patterns, flags)
+
+        union = self._union_patterns(compiled, flags)
+        if union is not None:
+            compiled = [union]
+        self._compiled = compiled
+        self._compiled_sig = sig
+        return compiled
+
+    @staticmethod
+    def _union_patterns(compiled: List[re.Pattern], flags: int) -> Optional[re.Pattern]:
+        """
+        将多个正则表达式合并为一个分支表达式
+
+        以下情况无法保证合并后语义不变，返回 None 由调用方逐个匹配:
+        - 模式内含内联标志 (如 (?i))，合并后会作用于其他模式或无法编译
+        - 使用数字反向引用的模式前面还有带捕获组的模式，组号会发生偏移
+        - 合并后编译失败 (如重复的命名组)
+        """
+        if len(compiled) < 2:
+            return None
+
+        base_flags = re.compile("", flags).flags
+        groups_before = 0
+        for p in compiled:
+            if p.flags != base_flags:
+                return None
+            if groups_before and _NUMERIC_GROUP_REF.search(p.pattern):
+                return None
+            groups_before += p.groups
+
+        try:
+            return re.compile("|".join(f"(?:{p.pattern})" for p in compiled), flags)
+        except (re.error, ValueError):
+            return None
 
     async def execute(self, message: MaiMessages | None) -> Tuple[bool, bool, str | None, None, None]:
         """
@@ -463,50 +734,74 @@ class IgnoreMessageHandler(BaseEventHandler):
                 - None: 保留参数
                 - None: 保留参数
         """
-        # 检查插件是否启用
-        plugin_enabled = self.get_config("plugin.enabled", True)
-        if not plugin_enabled:
+        cfg = self._get_config_snapshot()
+        if not cfg.active:
             return True, True, None, None, None
-        
-        # 获取消息文本
-        if not message or not message.plain_text:
+
+        # 获取消息文本 (逐条消息的属性只读取一次，保存为局部变量)
+        text = message.plain_text if message else None
+        if not text:
             return True, True, None, None, None
         
-        text = message.plain_text
-        debug_enabled = self.get_config("logging.debug", False)
-        log_ignored = self.get_config("logging.log_ignored", True)
-        
-        if debug_enabled:
-            logger.debug(f"检查消息: {text[:50]}...")
+        if cfg.debug and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("检查消息: %s...", text[:50])
         
         # 检查短语匹配
-        phrases_enabled = self.get_config("phrases.enabled", True)
-        if phrases_enabled:
-            # 直接从 config.toml 获取数据
-            phrase_list = self.get_config("phrases.list", [])
-            match_mode = self.get_config("phrases.match_mode", "contains")
-            case_sensitive = self.get_config("phrases.case_sensitive", False)
-            
-            if self._check_phrase_match(text, phrase_list, match_mode, case_sensitive):
-                if log_ignored:
-                    logger.info(f"[IgnorePhrasePlugin] 短语匹配拦截消息: {text[:50]}...")
-                return True, False, "短语匹配拦截", None, None
+        phrase_matcher = cfg.phrase_matcher
+        if phrase_matcher is not None and phrase_matcher(text):
+            if cfg.log_ignored:
+                logger.info("[IgnorePhrasePlugin] 短语匹配拦截消息: %s...", text[:50])
+            return True, False, "短语匹配拦截", None, None
         
         # 检查正则匹配
-        regex_enabled = self.get_config("regex.enabled", True)
-        if regex_enabled:
-            # 直接从 config.toml 获取数据
-            patterns = self.get_config("regex.patterns", [])
-            regex_case_sensitive = self.get_config("regex.case_sensitive", False)
-            
-            if self._check_regex_match(text, patterns, regex_case_sensitive):
-                if log_ignored:
-                    logger.info(f"[IgnorePhrasePlugin] 正则匹配拦截消息: {text[:50]}...")
+        for compiled in cfg.regex_patterns:
+            if compiled.search(text):
+                if cfg.log_ignored:
+                    logger.info("[IgnorePhrasePlugin] 正则匹配拦截消息: %s...", text[:50])
                 return True, False, "正则匹配拦截", None, None
         
         # 消息未匹配，继续处理
         return True, True, None, None, None
 
+    def _get_config_snapshot(self) -> SimpleNamespace:
+        """
+        获取当前配置的快照
+
+        逐条消息只读取快照属性，不再逐项查询配置。
+        plugin_config 被替换或快照超过 config_snapshot_ttl 秒时重新构建，
+        短语和正则的编译结果另有缓存，配置未变时重建快照的开销很小。
+        """
+        now = time.monotonic()
+        if self._cfg is not None and self.plugin_config is self._cfg_source and now < self._cfg_expires:
+            return self._cfg
+
+        plugin_enabled = self.get_config("plugin.enabled", True)
+
+        phrase_matcher = None
+        if self.get_config("phrases.enabled", True):
+            phrase_matcher = self._get_phrase_matcher(
+                self.get_config("phrases.list", []),
+                self.get_config("phrases.match_mode", "contains"),
+                self.get_config("phrases.case_sensitive", False),
+            )
+
+        regex_patterns: List[re.Pattern] = []
+        if self.get_config("regex.enabled", True):
+            regex_flags = 0 if self.get_config("regex.case_sensitive", False) else re.IGNORECASE
+            regex_patterns = self._get_compiled_patterns(self.get_config("regex.patterns", []), regex_flags)
+
+        self._cfg = SimpleNamespace(
+            # 插件启用且至少有一条可用规则时才需要检查消息
+            active=bool(plugin_enabled and (phrase_matcher is not None or regex_patterns)),
+            phrase_matcher=phrase_matcher,
+            regex_patterns=regex_patterns,
+            debug=self.get_config("logging.debug", False),
+            log_ignored=self.get_config("logging.log_ignored", True),
+        )
+        self._cfg_source = self.plugin_config
+        self._cfg_expires = now + self.config_snapshot_ttl
+        return self._cfg
+
 
 @register_plugin
 class IgnorePhrasePlugin(BasePlugin):